@@ -5,7 +5,7 @@ Orchestrates alarm subscription and Kafka consumption for Nokia fault notificati
 """
 
 import time
-from threading import Thread, Event
+from threading import Thread, Condition
 from typing import Optional, Callable
 
 from log_config import get_logger
@@ -16,6 +16,9 @@ from kafka_consumer import kafka_consumer
 # Get logger
 logger = get_logger(__name__)
 
+# Log banner built once at import instead of on every call
+_BANNER = "=" * 80
+
 
 class AlarmManager:
     """Manages alarm subscription and consumption lifecycle"""
@@ -23,23 +26,21 @@ class AlarmManager:
     _instance = None
 
     def __new__(cls):
-        """Singleton pattern"""
+        """Singleton pattern - state is set up once here so repeated
+        construction is a plain instance return with no __init__ guard"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            instance = super().__new__(cls)
+            instance.is_running = False
+            instance.renewal_thread: Optional[Thread] = None
+            # Single condition variable signals both shutdown and
+            # "renew now" requests to the renewal worker
+            instance._cv = Condition()
+            instance._stop = False
+            instance._renew_now = False
+            cls._instance = instance
+            logger.info("AlarmManager singleton instance created")
         return cls._instance
 
-    def __init__(self):
-        """Initialize alarm manager"""
-        if hasattr(self, '_initialized'):
-            return
-
-        self.is_running = False
-        self.renewal_thread: Optional[Thread] = None
-        self._stop_event = Event()
-
-        self._initialized = True
-        logger.info("AlarmManager singleton instance created")
-
     def initialize(self, message_handler: Optional[Callable] = None):
         """
         Initialize alarm system:
@@ -51,9 +52,9 @@ class AlarmManager:
         Args:
             message_handler: Optional custom message handler for Kafka messages
         """
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         logger.info("ALARM MANAGER - INITIALIZING")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
 
         try:
             # Step 1: Check token availability
@@ -77,7 +78,7 @@ class AlarmManager:
             # Step 3: Set message handler if provided
             if message_handler:
                 kafka_consumer.set_message_handler(message_handler)
-                logger.info(f"Custom message handler registered")
+                logger.info("Custom message handler registered")
             else:
                 logger.info("Using default message handler (console output)")
 
@@ -90,17 +91,17 @@ class AlarmManager:
 
             self.is_running = True
 
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("✓ ALARM MANAGER INITIALIZED SUCCESSFULLY")
-            logger.info(f"Subscription ID: {subscription_info.get('subscriptionId')}")
-            logger.info(f"Topic ID: {topic_id}")
-            logger.info(f"Listening for fault events...")
-            logger.info("=" * 80)
+            logger.info("Subscription ID: %s", subscription_info.get('subscriptionId'))
+            logger.info("Topic ID: %s", topic_id)
+            logger.info("Listening for fault events...")
+            logger.info(_BANNER)
 
         except Exception as e:
-            logger.error("=" * 80)
-            logger.error(f"✗ ALARM MANAGER INITIALIZATION FAILED: {e}")
-            logger.error("=" * 80)
+            logger.error(_BANNER)
+            logger.error("✗ ALARM MANAGER INITIALIZATION FAILED: %s", e)
+            logger.error(_BANNER)
             raise
 
     def _start_renewal_thread(self):
@@ -109,15 +110,17 @@ class AlarmManager:
             logger.warning("Renewal thread is already running")
             return
 
-        self._stop_event.clear()
+        with self._cv:
+            self._stop = False
+            self._renew_now = False
         self.renewal_thread = Thread(
             target=self._renewal_worker,
             daemon=True,
             name="SubscriptionRenewalThread"
         )
         self.renewal_thread.start()
-        logger.info(f"✓ Subscription renewal thread started")
-        logger.info(f"Renewals will occur every 30 minutes")
+        logger.info("✓ Subscription renewal thread started")
+        logger.info("Renewals will occur every 30 minutes")
 
     def _renewal_worker(self):
         """
@@ -128,11 +131,22 @@ class AlarmManager:
 
         renewal_interval = 30 * 60  # 30 minutes in seconds
 
-        while not self._stop_event.is_set():
-            # Wait for interval or stop event
-            if self._stop_event.wait(timeout=renewal_interval):
-                logger.info("Stop event received, exiting renewal worker")
-                break
+        while True:
+            # Sleep until a monotonic deadline so wall-clock jumps (NTP,
+            # DST) never skew the renewal schedule; the condition variable
+            # wakes us early on shutdown or an explicit trigger_renewal()
+            deadline = time.monotonic() + renewal_interval
+            with self._cv:
+                while not self._stop and not self._renew_now:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(timeout=remaining)
+
+                if self._stop:
+                    logger.info("Stop event received, exiting renewal worker")
+                    break
+                self._renew_now = False
 
             try:
                 logger.info("Auto-renewal cycle triggered")
@@ -142,7 +156,7 @@ class AlarmManager:
                 try:
                     token_manager.refresh_access_token()
                 except Exception as token_error:
-                    logger.error(f"Token refresh failed: {token_error}")
+                    logger.error("Token refresh failed: %s", token_error)
                     # Token manager will handle fallback, continue with subscription renewal
 
                 # Then renew subscription
@@ -172,26 +186,36 @@ class AlarmManager:
                     logger.info("✓ Auto-renewal cycle completed successfully")
 
             except Exception as e:
-                logger.error(f"✗ Auto-renewal failed: {e}")
+                logger.error("✗ Auto-renewal failed: %s", e)
                 logger.error("Will retry on next cycle")
 
         logger.info("Subscription renewal worker thread stopped")
 
+    def trigger_renewal(self):
+        """Wake the renewal worker immediately instead of waiting for the
+        next 30-minute deadline"""
+        with self._cv:
+            self._renew_now = True
+            self._cv.notify_all()
+        logger.info("Immediate renewal triggered")
+
     def shutdown(self):
         """Shutdown alarm manager gracefully"""
         if not self.is_running:
             logger.info("Alarm manager is not running")
             return
 
-        logger.info("=" * 80)
+        logger.info(_BANNER)
         logger.info("ALARM MANAGER - SHUTTING DOWN")
-        logger.info("=" * 80)
+        logger.info(_BANNER)
 
         try:
             # Stop renewal thread
             if self.renewal_thread and self.renewal_thread.is_alive():
                 logger.info("Stopping renewal thread...")
-                self._stop_event.set()
+                with self._cv:
+                    self._stop = True
+                    self._cv.notify_all()
                 self.renewal_thread.join(timeout=5)
                 if self.renewal_thread.is_alive():
                     logger.warning("Renewal thread did not stop gracefully")
@@ -208,12 +232,12 @@ class AlarmManager:
 
             self.is_running = False
 
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("✓ ALARM MANAGER SHUTDOWN COMPLETE")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
 
         except Exception as e:
-            logger.error(f"Error during alarm manager shutdown: {e}")
+            logger.error("Error during alarm manager shutdown: %s", e)
 
     def get_status(self) -> dict:
         """
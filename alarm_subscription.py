@@ -11,6 +11,7 @@ from typing import Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
+from http_client import build_session
 from log_config import get_logger
 from token_manager import token_manager
 
@@ -37,8 +38,34 @@ class AlarmSubscription:
         self.topic_id: Optional[str] = None
         self.expires_at: Optional[str] = None
 
+        # Request headers cached until the token rotates
+        self._cached_headers: Optional[Dict[str, str]] = None
+        self._cached_token_expiry = None
+
+        # Long-lived session from the shared factory: keep-alive plus the
+        # process-wide SSL context avoids a fresh TCP+TLS handshake on
+        # every subscription call
+        self._session = build_session(pool_connections=2, pool_maxsize=2,
+                                      backoff_factor=0.5)
+
         logger.info("AlarmSubscription initialized")
-        logger.info(f"Subscription Host: {self.subscription_host}:{self.subscription_port}")
+        logger.info("Subscription Host: %s:%s", self.subscription_host, self.subscription_port)
+
+    def _headers(self) -> Dict[str, str]:
+        """
+        Get request headers, rebuilding them only when the token rotates
+
+        Returns:
+            dict: Authorization and Content-Type headers
+        """
+        token_expiry = token_manager.token_expiry
+        if self._cached_headers is None or token_expiry != self._cached_token_expiry:
+            headers = token_manager.get_authorization_header()
+            headers["Content-Type"] = "application/json"
+            self._cached_headers = headers
+            self._cached_token_expiry = token_expiry
+
+        return self._cached_headers
 
     def create_subscription(self, category: str = "NSP-FAULT", property_filter: str = "severity = 'warning'") -> Dict:
         """
@@ -63,27 +90,25 @@ class AlarmSubscription:
         }
 
         try:
-            logger.info(f"Creating subscription for category: {category}")
-            logger.info(f"Subscription URL: {url}")
-            logger.debug(f"Property filter: {property_filter}")
+            logger.info("Creating subscription for category: %s", category)
+            logger.info("Subscription URL: %s", url)
+            logger.debug("Property filter: %s", property_filter)
 
-            # Get authorization header
-            headers = token_manager.get_authorization_header()
-            headers["Content-Type"] = "application/json"
+            # Get cached headers (rebuilt only on token rotation)
+            headers = self._headers()
 
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json=payload,
                 headers=headers,
-                verify=False,
                 timeout=30
             )
 
-            logger.debug(f"Subscription response status: {response.status_code}")
+            logger.debug("Subscription response status: %s", response.status_code)
             response.raise_for_status()
 
             response_data = response.json()
-            logger.debug(f"Subscription response: {response_data}")
+            logger.debug("Subscription response: %s", response_data)
 
             # Extract subscription info
             if 'response' in response_data and 'data' in response_data['response']:
@@ -101,15 +126,15 @@ class AlarmSubscription:
                 'expiresAt': self.expires_at
             }
 
-            logger.info(f"✓ Subscription created successfully")
-            logger.info(f"Subscription ID: {self.subscription_id}")
-            logger.info(f"Topic ID: {self.topic_id}")
-            logger.info(f"Expires at: {self.expires_at}")
+            logger.info("✓ Subscription created successfully")
+            logger.info("Subscription ID: %s", self.subscription_id)
+            logger.info("Topic ID: %s", self.topic_id)
+            logger.info("Expires at: %s", self.expires_at)
 
             return subscription_info
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to create subscription: {e}")
+            logger.error("✗ Failed to create subscription: %s", e)
             raise
 
     def renew_subscription(self) -> bool:
@@ -126,27 +151,25 @@ class AlarmSubscription:
         url = f"https://{self.subscription_host}:{self.subscription_port}/nbi-notification/api/v1/notifications/subscriptions/{self.subscription_id}/renewals"
 
         try:
-            logger.info(f"Renewing subscription: {self.subscription_id}")
+            logger.info("Renewing subscription: %s", self.subscription_id)
 
-            # Get authorization header
-            headers = token_manager.get_authorization_header()
-            headers["Content-Type"] = "application/json"
+            # Get cached headers (rebuilt only on token rotation)
+            headers = self._headers()
 
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json={},
                 headers=headers,
-                verify=False,
                 timeout=30
             )
 
             response.raise_for_status()
 
-            logger.info(f"✓ Subscription {self.subscription_id} renewed successfully")
+            logger.info("✓ Subscription %s renewed successfully", self.subscription_id)
             return True
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to renew subscription: {e}")
+            logger.error("✗ Failed to renew subscription: %s", e)
             return False
 
     def delete_subscription(self) -> bool:
@@ -163,28 +186,27 @@ class AlarmSubscription:
         url = f"https://{self.subscription_host}:{self.subscription_port}/nbi-notification/api/v1/notifications/subscriptions/{self.subscription_id}"
 
         try:
-            logger.info(f"Deleting subscription: {self.subscription_id}")
+            logger.info("Deleting subscription: %s", self.subscription_id)
 
-            # Get authorization header
-            headers = token_manager.get_authorization_header()
+            # Get cached headers (rebuilt only on token rotation)
+            headers = self._headers()
 
-            response = requests.delete(
+            response = self._session.delete(
                 url,
                 headers=headers,
-                verify=False,
                 timeout=30
             )
 
             response.raise_for_status()
 
-            logger.info(f"✓ Subscription {self.subscription_id} deleted successfully")
+            logger.info("✓ Subscription %s deleted successfully", self.subscription_id)
             self.subscription_id = None
             self.topic_id = None
             self.expires_at = None
             return True
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to delete subscription: {e}")
+            logger.error("✗ Failed to delete subscription: %s", e)
             return False
 
     def get_subscription_info(self) -> Dict:
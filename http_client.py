@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client Module
+One SSL context and session factory for all Nokia API subsystems
+"""
+
+import ssl
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Single TLS context for the self-signed Nokia certificates: built once
+# at import and shared by every session, so TLS session tickets can be
+# reused across subsystems (token refresh, alarm subscription, ...) and
+# no context is rebuilt per connection
+ssl_context = ssl.create_default_context()
+ssl_context.check_hostname = False
+ssl_context.verify_mode = ssl.CERT_NONE
+
+
+class SharedContextAdapter(HTTPAdapter):
+    """HTTPAdapter that injects the shared SSL context into its pools"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+def build_session(pool_connections: int = 4, pool_maxsize: int = 20,
+                  retries: int = 3, backoff_factor: float = 0.3) -> requests.Session:
+    """
+    Build a requests.Session wired to the shared SSL context
+
+    Args:
+        pool_connections: Number of connection pools to cache
+        pool_maxsize: Connections kept alive per pool
+        retries: Total retry attempts for transient 5xx responses
+        backoff_factor: Exponential backoff factor between retries
+
+    Returns:
+        requests.Session: Pooled session with certificate verification disabled
+    """
+    session = requests.Session()
+    session.mount('https://', SharedContextAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=backoff_factor,
+                          status_forcelist=[502, 503, 504])
+    ))
+    session.verify = False  # Self-signed certificates
+    return session
@@ -5,10 +5,14 @@ Handles writing Kafka messages to JSONL (JSON Lines) format file
 """
 
 import os
-import json
+import time
+import queue
+import atexit
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+from threading import Lock, Thread
+from typing import Dict, Any, Optional
+import orjson
 from dotenv import load_dotenv
 
 from log_config import get_logger
@@ -21,99 +25,256 @@ load_dotenv()
 
 
 class JSONLHandler:
-    """Handler for writing Kafka messages to JSONL file"""
+    """Handler for writing Kafka messages to JSONL file
+
+    Writes can be sharded across several output files (JSONL_NUM_SHARDS)
+    keyed by the Kafka partition, giving each shard its own queue, writer
+    thread and file descriptor so partitions never contend on one lock.
+    """
+
+    # Bound on queued messages waiting for each writer thread
+    QUEUE_MAX = 10000
+    # Maximum messages drained into a single write batch
+    BATCH_MAX = 256
 
     def __init__(self):
         """Initialize JSONL handler"""
         self.output_file = os.getenv('KAFKA_MESSAGES_FILE', 'logs/kafka_messages.jsonl')
+        self.num_shards = max(1, int(os.getenv('JSONL_NUM_SHARDS', '1')))
 
         # Ensure directory exists
-        output_dir = Path(self.output_file).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = Path(self.output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # With a single shard the configured filename is kept as-is;
+        # sharded mode appends the shard index (kafka_messages_0.jsonl, ...)
+        if self.num_shards == 1:
+            self.shard_files = [self.output_file]
+        else:
+            self.shard_files = [
+                str(output_path.with_name(f"{output_path.stem}_{i}{output_path.suffix}"))
+                for i in range(self.num_shards)
+            ]
 
-        logger.info(f"JSONLHandler initialized")
-        logger.info(f"Output file: {self.output_file}")
+        # Per shard: a long-lived file descriptor (no open/close syscalls
+        # per message), a lock, a bounded queue and a dedicated writer
+        # thread that drains the queue in batches and submits each batch
+        # with a single os.write
+        self._fds = [
+            os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            for path in self.shard_files
+        ]
+        self._write_locks = [Lock() for _ in range(self.num_shards)]
+        self._write_queues = [
+            queue.Queue(maxsize=self.QUEUE_MAX) for _ in range(self.num_shards)
+        ]
+        self._writer_threads = []
+        for shard in range(self.num_shards):
+            thread = Thread(
+                target=self._writer_worker,
+                args=(shard,),
+                daemon=True,
+                name=f"JSONLWriterThread-{shard}"
+            )
+            thread.start()
+            self._writer_threads.append(thread)
+        atexit.register(self._close)
 
-    def write_message(self, message: Dict[Any, Any]) -> bool:
+        logger.info("JSONLHandler initialized")
+        logger.info("Output file(s): %s", ", ".join(self.shard_files))
+
+    def _shard_index(self, partition_hint) -> int:
+        """Map a Kafka partition (or None) onto a shard index"""
+        if self.num_shards == 1:
+            return 0
+        return hash(partition_hint) % self.num_shards
+
+    def write_message(self, message: Dict[Any, Any], partition_hint: Optional[int] = None) -> bool:
         """
         Write a Kafka message to JSONL file
 
         Args:
             message: Message dict from Kafka
+            partition_hint: Kafka partition used to pick the output shard
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Add metadata
+            # Add metadata - read the clock once per message; received_at
+            # keeps the raw epoch float so consumers format it on read
+            now = time.time()
             enriched_message = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "received_at": datetime.now().isoformat(),
+                "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+                "received_at": now,
                 "message": message
             }
 
-            # Write to file (append mode)
-            with open(self.output_file, 'a', encoding='utf-8') as f:
-                json_line = json.dumps(enriched_message, ensure_ascii=False)
-                f.write(json_line + '\n')
+            # Hand off to the writer thread; the consumer thread never
+            # blocks on disk latency
+            self._write_queues[self._shard_index(partition_hint)].put_nowait(enriched_message)
 
-            logger.debug(f"Message written to {self.output_file}")
+            logger.debug("Message queued for %s", self.output_file)
             return True
 
+        except queue.Full:
+            logger.error("JSONL write queue full, dropping message")
+            return False
         except Exception as e:
-            logger.error(f"Failed to write message to JSONL: {e}", exc_info=True)
+            logger.error("Failed to write message to JSONL: %s", e, exc_info=True)
             return False
 
-    def get_message_count(self) -> int:
+    def write_raw(self, raw: bytes, partition_hint: Optional[int] = None) -> bool:
         """
-        Get total number of messages in JSONL file
+        Write an already-encoded JSON message to JSONL file
+
+        The raw Kafka bytes are spliced into a pre-built envelope without
+        ever being parsed or re-serialized.
+
+        Args:
+            raw: JSON-encoded message bytes as received from Kafka
+            partition_hint: Kafka partition used to pick the output shard
 
         Returns:
-            int: Number of messages (lines) in file
+            bool: True if successful, False otherwise
         """
         try:
-            if not Path(self.output_file).exists():
-                return 0
+            now = time.time()
+            timestamp = datetime.fromtimestamp(now, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+            line = (
+                b'{"timestamp":"' + timestamp.encode('ascii')
+                + b'","received_at":' + repr(now).encode('ascii')
+                + b',"message":' + raw + b'}\n'
+            )
+
+            self._write_queues[self._shard_index(partition_hint)].put_nowait(line)
+
+            logger.debug("Message queued for %s", self.output_file)
+            return True
+
+        except queue.Full:
+            logger.error("JSONL write queue full, dropping message")
+            return False
+        except Exception as e:
+            logger.error("Failed to write message to JSONL: %s", e, exc_info=True)
+            return False
+
+    def _writer_worker(self, shard: int):
+        """Writer thread: drain queued messages in batches and submit each
+        batch to disk with a single write"""
+        write_queue = self._write_queues[shard]
+        write_lock = self._write_locks[shard]
+
+        while True:
+            batch = [write_queue.get()]
+            while len(batch) < self.BATCH_MAX:
+                try:
+                    batch.append(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            buffer = bytearray()
+            for message in batch:
+                try:
+                    if isinstance(message, (bytes, bytearray)):
+                        # Pre-encoded line from write_raw
+                        buffer += message
+                    else:
+                        # orjson emits UTF-8 bytes directly (no encode step)
+                        buffer += orjson.dumps(message)
+                        buffer += b'\n'
+                except Exception as e:
+                    logger.error("Failed to serialize message to JSONL: %s", e, exc_info=True)
+
+            try:
+                if buffer:
+                    with write_lock:
+                        os.write(self._fds[shard], buffer)
+            except Exception as e:
+                logger.error("Failed to write batch to JSONL: %s", e, exc_info=True)
+            finally:
+                for _ in batch:
+                    write_queue.task_done()
+
+    def flush(self):
+        """Block until all queued messages have been written to disk"""
+        for write_queue in self._write_queues:
+            write_queue.join()
+
+    def _close(self):
+        """Drain the queues and close the output files (registered with atexit)"""
+        try:
+            for shard in range(self.num_shards):
+                if self._writer_threads[shard].is_alive():
+                    self._write_queues[shard].join()
+                with self._write_locks[shard]:
+                    if self._fds[shard] >= 0:
+                        os.close(self._fds[shard])
+                        self._fds[shard] = -1
+        except Exception as e:
+            logger.error("Failed to close JSONL file: %s", e)
+
+    def get_message_count(self) -> int:
+        """
+        Get total number of messages in JSONL file(s)
 
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                return sum(1 for _ in f)
+        Returns:
+            int: Number of messages (lines) across all shards
+        """
+        try:
+            self.flush()
+            count = 0
+            for path in self.shard_files:
+                if not Path(path).exists():
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    count += sum(1 for _ in f)
+            return count
 
         except Exception as e:
-            logger.error(f"Failed to count messages: {e}")
+            logger.error("Failed to count messages: %s", e)
             return 0
 
     def get_file_size(self) -> int:
         """
-        Get size of JSONL file in bytes
+        Get size of JSONL file(s) in bytes
 
         Returns:
-            int: File size in bytes
+            int: Total file size in bytes across all shards
         """
         try:
-            if not Path(self.output_file).exists():
-                return 0
-
-            return Path(self.output_file).stat().st_size
+            self.flush()
+            return sum(
+                Path(path).stat().st_size
+                for path in self.shard_files
+                if Path(path).exists()
+            )
 
         except Exception as e:
-            logger.error(f"Failed to get file size: {e}")
+            logger.error("Failed to get file size: %s", e)
             return 0
 
     def clear_file(self) -> bool:
         """
-        Clear the JSONL file (useful for testing or maintenance)
+        Clear the JSONL file(s) (useful for testing or maintenance)
 
         Returns:
             bool: True if successful
         """
         try:
-            if Path(self.output_file).exists():
-                Path(self.output_file).unlink()
-                logger.info(f"Cleared JSONL file: {self.output_file}")
+            self.flush()
+            for shard, path in enumerate(self.shard_files):
+                with self._write_locks[shard]:
+                    if self._fds[shard] >= 0:
+                        os.close(self._fds[shard])
+                    if Path(path).exists():
+                        Path(path).unlink()
+                    self._fds[shard] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            logger.info("Cleared JSONL file(s): %s", ", ".join(self.shard_files))
             return True
 
         except Exception as e:
-            logger.error(f"Failed to clear JSONL file: {e}")
+            logger.error("Failed to clear JSONL file: %s", e)
             return False
 
 
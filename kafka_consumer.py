@@ -5,8 +5,9 @@ Handles Kafka connection and message consumption for Nokia alarms/faults
 """
 
 import os
-import json
 import ssl
+import logging
+import orjson
 from threading import Thread, Event
 from typing import Optional, Callable
 from kafka import KafkaConsumer
@@ -45,8 +46,8 @@ class NokiaKafkaConsumer:
         self.topic_id: Optional[str] = None
 
         logger.info("NokiaKafkaConsumer initialized")
-        logger.info(f"Kafka Broker: {self.kafka_broker}:{self.kafka_port}")
-        logger.info(f"Group ID: {self.kafka_group_id}")
+        logger.info("Kafka Broker: %s:%s", self.kafka_broker, self.kafka_port)
+        logger.info("Group ID: %s", self.kafka_group_id)
 
     def create_consumer(self, topic_id: str) -> KafkaConsumer:
         """
@@ -74,15 +75,17 @@ class NokiaKafkaConsumer:
         ssl_context.verify_mode = ssl.CERT_NONE
 
         try:
-            logger.info(f"Creating Kafka consumer for topic: {topic_id}")
+            logger.info("Creating Kafka consumer for topic: %s", topic_id)
 
             consumer = KafkaConsumer(
                 topic_id,
                 bootstrap_servers=f"{self.kafka_broker}:{self.kafka_port}",
                 group_id=self.kafka_group_id,
                 auto_offset_reset='earliest',
-                enable_auto_commit=False,  # Disable auto-commit to avoid errors on expired topics
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')) if m else None,
+                enable_auto_commit=False,  # Offsets are committed manually per processed batch
+                # Keep raw bytes: the default JSONL path writes them as-is,
+                # so most messages are never parsed or re-serialized
+                value_deserializer=lambda m: m,
                 security_protocol='SSL',
                 ssl_context=ssl_context,
                 # Connection settings to reduce initial connection errors
@@ -98,7 +101,7 @@ class NokiaKafkaConsumer:
             return consumer
 
         except Exception as e:
-            logger.error(f"✗ Failed to create Kafka consumer: {e}")
+            logger.error("✗ Failed to create Kafka consumer: %s", e)
             raise
 
     def set_message_handler(self, handler: Callable):
@@ -109,7 +112,7 @@ class NokiaKafkaConsumer:
             handler: Callable that takes message as parameter
         """
         self.message_handler = handler
-        logger.info(f"Message handler set: {handler.__name__}")
+        logger.info("Message handler set: %s", handler.__name__)
 
     def start_consuming(self, topic_id: str):
         """
@@ -135,71 +138,101 @@ class NokiaKafkaConsumer:
             )
             self.consumer_thread.start()
 
-            logger.info(f"✓ Started consuming from topic: {topic_id}")
-            logger.info(f"Consumer thread: {self.consumer_thread.name}")
+            logger.info("✓ Started consuming from topic: %s", topic_id)
+            logger.info("Consumer thread: %s", self.consumer_thread.name)
 
         except Exception as e:
-            logger.error(f"✗ Failed to start consuming: {e}")
+            logger.error("✗ Failed to start consuming: %s", e)
             raise
 
     def _consume_worker(self):
         """Worker thread for consuming Kafka messages"""
         logger.info("Kafka consumer worker thread started")
-        logger.info(f"Listening for messages on topic: {self.topic_id}")
+        logger.info("Listening for messages on topic: %s", self.topic_id)
 
         message_count = 0
 
         try:
-            for message in self.consumer:
-                if self._stop_event.is_set():
-                    logger.info("Stop event received, exiting consumer worker")
-                    break
-
-                message_count += 1
-
+            # Batched polling: one poll() round-trip returns up to
+            # max_records messages, amortizing coordination overhead
+            # instead of pulling messages one at a time
+            while not self._stop_event.is_set():
+                records = self.consumer.poll(timeout_ms=500, max_records=500)
+                if not records:
+                    continue
+
+                for topic_partition, messages in records.items():
+                    for message in messages:
+                        message_count += 1
+
+                        try:
+                            self._process_message(message, message_count)
+                        except Exception as e:
+                            logger.error("✗ Error processing message: %s", e, exc_info=True)
+
+                # Commit offsets once per processed batch instead of on a
+                # background timer: fewer commit RPCs, and offsets are only
+                # acknowledged after the batch reached the JSONL sink
                 try:
-                    # Log message metadata
-                    logger.debug(f"Received message from partition {message.partition}, offset {message.offset}")
-
-                    # Get message value
-                    message_value = message.value
-
-                    if message_value:
-                        logger.info(f"✓ Message #{message_count} received from Kafka")
-                        logger.debug(f"Message content: {json.dumps(message_value, indent=2)}")
-
-                        # Call message handler if set
-                        if self.message_handler:
-                            self.message_handler(message_value)
-                        else:
-                            # Default: print to console
-                            self._default_message_handler(message_value)
-
+                    self.consumer.commit_async()
                 except Exception as e:
-                    logger.error(f"✗ Error processing message: {e}", exc_info=True)
+                    logger.debug("Offset commit failed: %s", e)
+
+            logger.info("Stop event received, exiting consumer worker")
 
         except KafkaError as e:
-            logger.error(f"✗ Kafka error in consumer worker: {e}")
+            logger.error("✗ Kafka error in consumer worker: %s", e)
         except Exception as e:
-            logger.error(f"✗ Unexpected error in consumer worker: {e}", exc_info=True)
+            logger.error("✗ Unexpected error in consumer worker: %s", e, exc_info=True)
         finally:
-            logger.info(f"Kafka consumer worker stopped. Total messages processed: {message_count}")
+            logger.info("Kafka consumer worker stopped. Total messages processed: %s", message_count)
+
+    def _process_message(self, message, message_count: int):
+        """
+        Process a single Kafka message from a polled batch
+
+        Args:
+            message: ConsumerRecord from Kafka
+            message_count: Running total of processed messages
+        """
+        # Log message metadata
+        logger.debug("Received message from partition %s, offset %s", message.partition, message.offset)
+
+        # Get raw message bytes
+        raw_value = message.value
+
+        if raw_value:
+            # Keep per-message logging off the hot path: INFO only
+            # every 1000 messages, and skip the payload dump
+            # entirely unless DEBUG is enabled
+            if message_count % 1000 == 0:
+                logger.info("✓ Message #%s received from Kafka", message_count)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message content: %s", raw_value.decode('utf-8', 'replace'))
+
+            # Custom handlers receive a parsed dict; the default JSONL
+            # path passes the raw bytes straight through
+            if self.message_handler:
+                self.message_handler(orjson.loads(raw_value))
+            else:
+                self._default_message_handler(raw_value, message.partition)
 
-    def _default_message_handler(self, message: dict):
+    def _default_message_handler(self, raw_value: bytes, partition: int = None):
         """
         Default message handler - prints to console and writes to JSONL file
 
         Args:
-            message: Message dict from Kafka
+            raw_value: Raw JSON message bytes from Kafka
+            partition: Kafka partition, used to pick the JSONL shard
         """
-        # Write to JSONL file
-        jsonl_handler.write_message(message)
+        # Write raw bytes to JSONL file (no parse/re-serialize round-trip)
+        jsonl_handler.write_raw(raw_value, partition)
 
         # Print to console
         print("\n" + "=" * 80)
         print("NEW ALARM/FAULT EVENT")
         print("=" * 80)
-        print(json.dumps(message, indent=2))
+        print(raw_value.decode('utf-8', 'replace'))
         print("=" * 80 + "\n")
 
     def stop_consuming(self):
@@ -217,7 +250,7 @@ class NokiaKafkaConsumer:
                 self.consumer.close()
                 logger.info("Kafka consumer closed")
             except Exception as e:
-                logger.error(f"Error closing Kafka consumer: {e}")
+                logger.error("Error closing Kafka consumer: %s", e)
 
         # Wait for thread to finish
         if self.consumer_thread:
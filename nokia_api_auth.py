@@ -6,25 +6,30 @@ Handles authentication, token refresh, and authenticated API requests
 
 import requests
 import time
+import base64
 import logging
-import json
+import orjson
 import os
+import signal
 from datetime import datetime, timedelta
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 import urllib3
 from typing import Optional, Dict
 from dotenv import load_dotenv
 
+from http_client import build_session
+from log_config import get_logger
+
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+# Trail API base URL (OMS host, different port than the auth gateway) -
+# resolved once at import instead of rebuilt per call
+TRAIL_BASE = os.getenv('NOKIA_TRAIL_BASE', 'https://10.73.0.181:8443/oms1350/data/npr/trails')
 
+# Get configured logger (shared rotating/queued handlers, same as the
+# gateway - no separate basicConfig root setup)
+logger = get_logger(__name__)
 
 class NokiaAPIAuth:
     """Manages authentication and token refresh for Nokia API"""
@@ -47,9 +52,35 @@ class NokiaAPIAuth:
         self.expires_in: int = 3600
         self.token_expiry: Optional[datetime] = None
 
+        # Pre-encode the Basic Auth header once; credentials never change
+        # for the lifetime of this instance
+        encoded_credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self._basic_auth_header = {
+            "Authorization": f"Basic {encoded_credentials}",
+            "Content-Type": "application/json"
+        }
+        # Bearer header cache, rebuilt whenever the token changes
+        self._bearer_header: Optional[Dict[str, str]] = None
+
+        # Long-lived session from the shared factory: urllib3 pools
+        # keep-alive connections (only the first request to each host
+        # pays the TLS handshake) and the process-wide SSL context is
+        # reused instead of rebuilt per pool. Pool sized to the expected
+        # concurrency target so concurrent callers reuse keep-alive
+        # connections instead of opening new ones.
+        self._session = build_session(
+            pool_connections=16,
+            pool_maxsize=int(os.getenv('POOL_MAXSIZE', '64')),
+            backoff_factor=0.2
+        )
+
         # Threading control
         self._stop_event = Event()
         self._refresh_thread: Optional[Thread] = None
+        # Single-flight lock: concurrent refresh attempts coalesce into
+        # one POST to the Nokia auth endpoint
+        self._refresh_lock = Lock()
+        self._last_refresh: float = 0.0
 
     def get_initial_token(self) -> Dict:
         """
@@ -58,42 +89,38 @@ class NokiaAPIAuth:
         Returns:
             dict: Token response containing access_token, refresh_token, etc.
         """
-        import base64
-
         url = f"{self.base_url}/auth/token"
         payload = {
             "grant_type": "client_credentials"
         }
 
-        # Create Basic Auth header manually
-        credentials = f"{self.username}:{self.password}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        headers = {
-            "Authorization": f"Basic {encoded_credentials}",
-            "Content-Type": "application/json"
-        }
-
         try:
-            logger.info(f"Requesting initial token from {url}")
-            logger.debug(f"Username: {self.username}")
-            logger.debug(f"Authorization header: Basic {encoded_credentials}")
-            logger.debug(f"Payload: {payload}")
+            logger.info("Requesting initial token from %s", url)
+            logger.debug("Username: %s", self.username)
+            logger.debug("Authorization header: %s", self._basic_auth_header['Authorization'])
+            logger.debug("Payload: %s", payload)
 
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers=headers,
+                headers=self._basic_auth_header,
                 json=payload,
-                verify=False,  # Disable SSL verification for self-signed certs
                 timeout=30
             )
 
-            logger.debug(f"Response status: {response.status_code}")
-            logger.debug(f"Response headers: {dict(response.headers)}")
-            logger.debug(f"Response body: {response.text}")
+            logger.debug("Response status: %s", response.status_code)
+            # Pass the CaseInsensitiveDict directly: its repr only runs if
+            # a handler accepts the record, so no dict copy when DEBUG is off
+            logger.debug("Response headers: %s", response.headers)
+            # response.text decodes the whole body to str; only pay for
+            # that when DEBUG output is actually going somewhere
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response body: %s", response.text)
 
             response.raise_for_status()
 
-            token_data = response.json()
+            # Single parse from the raw bytes (response.json() would
+            # decode to str first and re-parse with stdlib json)
+            token_data = orjson.loads(response.content)
 
             # Update internal state
             self.access_token = token_data.get('access_token')
@@ -101,14 +128,15 @@ class NokiaAPIAuth:
             self.token_type = token_data.get('token_type', 'Bearer')
             self.expires_in = token_data.get('expires_in', 3600)
             self.token_expiry = datetime.now() + timedelta(seconds=self.expires_in)
+            self._bearer_header = {"Authorization": f"{self.token_type} {self.access_token}"}
 
-            logger.info(f"Token obtained successfully. Expires in {self.expires_in} seconds")
-            logger.info(f"Token expiry time: {self.token_expiry}")
+            logger.info("Token obtained successfully. Expires in %s seconds", self.expires_in)
+            logger.info("Token expiry time: %s", self.token_expiry)
 
             return token_data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to obtain initial token: {e}")
+            logger.error("Failed to obtain initial token: %s", e)
             raise
 
     def refresh_access_token(self) -> Dict:
@@ -121,38 +149,53 @@ class NokiaAPIAuth:
         if not self.refresh_token:
             raise ValueError("No refresh token available. Please obtain initial token first.")
 
-        url = f"{self.base_url}/auth/token"
-        payload = {
-            "grant_type": "refresh_token",
-            "refresh_token": self.refresh_token
-        }
+        with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the
+            # lock; a burst of K concurrent refreshes then hits the Nokia
+            # auth endpoint once instead of K times. The window is short
+            # so the scheduled proactive refresh is never skipped.
+            if time.monotonic() - self._last_refresh < 10:
+                logger.debug("Token already refreshed by a concurrent caller, skipping")
+                return {
+                    'access_token': self.access_token,
+                    'refresh_token': self.refresh_token,
+                    'token_type': self.token_type,
+                    'expires_in': self.expires_in
+                }
+
+            url = f"{self.base_url}/auth/token"
+            payload = {
+                "grant_type": "refresh_token",
+                "refresh_token": self.refresh_token
+            }
 
-        try:
-            logger.info("Refreshing access token...")
-            response = requests.post(
-                url,
-                json=payload,
-                verify=False,
-                timeout=30
-            )
-            response.raise_for_status()
+            try:
+                logger.info("Refreshing access token...")
+                response = self._session.post(
+                    url,
+                    json=payload,
+                    timeout=30
+                )
+                response.raise_for_status()
 
-            token_data = response.json()
+                token_data = orjson.loads(response.content)
 
-            # Update internal state
-            self.access_token = token_data.get('access_token')
-            self.refresh_token = token_data.get('refresh_token')
-            self.token_type = token_data.get('token_type', 'Bearer')
-            self.expires_in = token_data.get('expires_in', 3600)
-            self.token_expiry = datetime.now() + timedelta(seconds=self.expires_in)
+                # Update internal state
+                self.access_token = token_data.get('access_token')
+                self.refresh_token = token_data.get('refresh_token')
+                self.token_type = token_data.get('token_type', 'Bearer')
+                self.expires_in = token_data.get('expires_in', 3600)
+                self.token_expiry = datetime.now() + timedelta(seconds=self.expires_in)
+                self._bearer_header = {"Authorization": f"{self.token_type} {self.access_token}"}
+                self._last_refresh = time.monotonic()
 
-            logger.info(f"Token refreshed successfully. New expiry: {self.token_expiry}")
+                logger.info("Token refreshed successfully. New expiry: %s", self.token_expiry)
 
-            return token_data
+                return token_data
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to refresh token: {e}")
-            raise
+            except requests.exceptions.RequestException as e:
+                logger.error("Failed to refresh token: %s", e)
+                raise
 
     def get_authorization_header(self) -> Dict[str, str]:
         """
@@ -161,24 +204,29 @@ class NokiaAPIAuth:
         Returns:
             dict: Authorization header
         """
-        if not self.access_token:
+        if not self._bearer_header:
             raise ValueError("No access token available. Please authenticate first.")
 
-        return {
-            "Authorization": f"{self.token_type} {self.access_token}"
-        }
+        # O(1) copy of the header cached at refresh time - no f-string
+        # formatting per request
+        return dict(self._bearer_header)
 
-    def start_auto_refresh(self, refresh_interval: int = 3600):
+    def start_auto_refresh(self, refresh_interval: Optional[int] = None):
         """
         Start automatic token refresh in background thread
 
         Args:
-            refresh_interval: Interval in seconds between token refreshes (default: 3600 = 60 minutes)
+            refresh_interval: Interval in seconds between token refreshes
+                (default: 80% of the server-reported expires_in, so the
+                token is always renewed before it can expire)
         """
         if self._refresh_thread and self._refresh_thread.is_alive():
             logger.warning("Auto-refresh is already running")
             return
 
+        if refresh_interval is None:
+            refresh_interval = max(60, int(self.expires_in * 0.8))
+
         self._stop_event.clear()
         self._refresh_thread = Thread(
             target=self._auto_refresh_worker,
@@ -186,31 +234,48 @@ class NokiaAPIAuth:
             daemon=True
         )
         self._refresh_thread.start()
-        logger.info(f"Auto-refresh started with interval: {refresh_interval} seconds")
+        logger.info("Auto-refresh started with initial interval: %s seconds", refresh_interval)
 
     def _auto_refresh_worker(self, interval: int):
         """
         Worker thread for automatic token refresh
 
         Args:
-            interval: Refresh interval in seconds
+            interval: Initial refresh interval in seconds; after each
+                successful refresh the interval is recomputed from the
+                server-reported expires_in
         """
+        backoff = 0
+
         while not self._stop_event.is_set():
-            # Wait for the specified interval or until stop event is set
-            if self._stop_event.wait(timeout=interval):
+            # Wait for the interval (or a shorter backoff after a failure)
+            # or until stop event is set
+            if self._stop_event.wait(timeout=backoff if backoff else interval):
                 break
 
             try:
                 self.refresh_access_token()
+                backoff = 0
+                # Track the server's actual token lifetime: if expires_in
+                # shrinks, the next wait shrinks with it instead of
+                # refreshing too late
+                interval = max(60, int(self.expires_in * 0.8))
             except Exception as e:
-                logger.error(f"Auto-refresh failed: {e}")
+                # Retry soon with exponential backoff instead of waiting
+                # out the full interval with an expired token
+                backoff = min(interval, backoff * 2 if backoff else 5)
+                logger.error("Auto-refresh failed: %s; retrying in %s seconds", e, backoff)
 
     def stop_auto_refresh(self):
         """Stop the automatic token refresh"""
         if self._refresh_thread and self._refresh_thread.is_alive():
             logger.info("Stopping auto-refresh...")
             self._stop_event.set()
-            self._refresh_thread.join(timeout=5)
+            # Close the session to break any in-flight POST (up to 30s
+            # otherwise): the worker sees a RequestException, logs it and
+            # re-checks the stop event, so the join returns quickly
+            self._session.close()
+            self._refresh_thread.join(timeout=2)
             logger.info("Auto-refresh stopped")
 
     def make_authenticated_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
@@ -229,11 +294,10 @@ class NokiaAPIAuth:
         headers = kwargs.pop('headers', {})
         headers.update(self.get_authorization_header())
 
-        response = requests.request(
+        response = self._session.request(
             method=method,
             url=url,
             headers=headers,
-            verify=False,
             **kwargs
         )
 
@@ -249,28 +313,28 @@ class NokiaAPIAuth:
         Returns:
             dict: Trail list data
         """
-        endpoint = f"https://10.73.0.181:8443/oms1350/data/npr/trails/{network_id}"
+        endpoint = f"{TRAIL_BASE}/{network_id}"
 
         try:
-            logger.info(f"Fetching trail list for network ID: {network_id}")
+            logger.info("Fetching trail list for network ID: %s", network_id)
 
             # Make direct request (different base URL)
             headers = self.get_authorization_header()
-            response = requests.get(
+            response = self._session.get(
                 endpoint,
                 headers=headers,
-                verify=False,
                 timeout=30
             )
             response.raise_for_status()
 
-            trail_data = response.json()
-            logger.info(f"Successfully retrieved trail list. Count: {len(trail_data) if isinstance(trail_data, list) else 'N/A'}")
+            trail_data = orjson.loads(response.content)
+            logger.info("Successfully retrieved trail list. Count: %s",
+                        len(trail_data) if isinstance(trail_data, list) else 'N/A')
 
             return trail_data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get trail list: {e}")
+            logger.error("Failed to get trail list: %s", e)
             raise
 
     def get_trail_current_route(self, trail_id: str) -> Dict:
@@ -283,28 +347,27 @@ class NokiaAPIAuth:
         Returns:
             dict: Trail current route data
         """
-        endpoint = f"https://10.73.0.181:8443/oms1350/data/npr/trails/{trail_id}/currentRoute"
+        endpoint = f"{TRAIL_BASE}/{trail_id}/currentRoute"
 
         try:
-            logger.info(f"Fetching current route for trail ID: {trail_id}")
+            logger.info("Fetching current route for trail ID: %s", trail_id)
 
             # Make direct request (different base URL)
             headers = self.get_authorization_header()
-            response = requests.get(
+            response = self._session.get(
                 endpoint,
                 headers=headers,
-                verify=False,
                 timeout=30
             )
             response.raise_for_status()
 
-            route_data = response.json()
-            logger.info(f"Successfully retrieved current route for trail {trail_id}")
+            route_data = orjson.loads(response.content)
+            logger.info("Successfully retrieved current route for trail %s", trail_id)
 
             return route_data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get current route: {e}")
+            logger.error("Failed to get current route: %s", e)
             raise
 
 
@@ -319,25 +382,22 @@ def main():
     USERNAME = os.getenv('API_USERNAME', 'api_user')
     PASSWORD = os.getenv('API_PASSWORD', 'api_user@')
 
-    logger.info(f"Loaded configuration - URL: {BASE_URL}, Username: {USERNAME}")
+    logger.info("Loaded configuration - URL: %s, Username: %s", BASE_URL, USERNAME)
 
     # Initialize authentication manager
     auth = NokiaAPIAuth(BASE_URL, USERNAME, PASSWORD)
 
     try:
-        # Get initial token
+        # Get initial token. The logger (console handler) is the single
+        # sink: no duplicate print of the same payload
         initial_token = auth.get_initial_token()
-        print("\n=== Initial Token Response ===")
-        print(json.dumps(initial_token, indent=2))
-
-        print(f"\nAccess Token: {auth.access_token}")
-        print(f"Refresh Token: {auth.refresh_token}")
-        print(f"Token Type: {auth.token_type}")
-        print(f"Expires In: {auth.expires_in} seconds")
-        print(f"Token Expiry: {auth.token_expiry}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initial token response: %s", orjson.dumps(initial_token).decode())
+        logger.info("Token type: %s, expires in %s seconds (expiry: %s)",
+                    auth.token_type, auth.expires_in, auth.token_expiry)
 
-        # Start automatic token refresh every 50 minutes (3000 seconds)
-        auth.start_auto_refresh(refresh_interval=3000)
+        # Start automatic token refresh at 80% of the token lifetime
+        auth.start_auto_refresh()
 
         print("\n=== Token auto-refresh is active ===")
         print("Making API requests...\n")
@@ -348,14 +408,14 @@ def main():
             network_id = "788602"
             trail_list = auth.get_trail_list(network_id)
 
-            logger.info(f"Trail List Response for network {network_id}:")
-            logger.info(f"Response type: {type(trail_list)}")
-            logger.info(f"Response data: {json.dumps(trail_list, indent=2)}")
-
-            print(f"\nTrail List for Network {network_id}:")
-            print(json.dumps(trail_list, indent=2))
+            logger.info("Trail List Response for network %s received (type: %s)",
+                        network_id, type(trail_list).__name__)
+            # Serializing the full payload is O(N) CPU plus heavy log I/O;
+            # only pay for it when someone is actually debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response data: %s", orjson.dumps(trail_list).decode())
         except Exception as e:
-            logger.error(f"Failed to retrieve trail list: {e}")
+            logger.error("Failed to retrieve trail list: %s", e)
 
         # Example 2: Get Trail Current Route (commented out for now)
         # try:
@@ -374,19 +434,25 @@ def main():
 
         # Keep the program running to maintain token refresh
         print("\n=== Program is running ===")
-        print("Token will auto-refresh every 50 minutes.")
+        print("Token will auto-refresh before expiry.")
         print("Press Ctrl+C to stop...\n")
 
-        # Keep main thread alive
-        while True:
-            time.sleep(10)
+        # Block until a shutdown signal arrives instead of waking every
+        # 10 seconds to do nothing - the main thread idles completely
+        shutdown_event = Event()
+        signal.signal(signal.SIGINT, lambda signum, frame: shutdown_event.set())
+        signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_event.set())
+        shutdown_event.wait()
+
+        print("\n\nShutting down...")
+        auth.stop_auto_refresh()
 
     except KeyboardInterrupt:
         print("\n\nShutting down...")
         auth.stop_auto_refresh()
 
     except Exception as e:
-        logger.error(f"Error in main: {e}")
+        logger.error("Error in main: %s", e)
         auth.stop_auto_refresh()
         raise
 
@@ -4,14 +4,20 @@ Nokia Gateway API
 FastAPI-based REST Gateway for Nokia API with automatic token management
 """
 
-import requests
+import os
+import time
+import asyncio
+import logging
+import httpx
+import orjson
 import urllib3
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+import http_client
 from log_config import get_logger
 from token_manager import token_manager
 from alarm_manager import alarm_manager
@@ -22,6 +28,33 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Get configured logger
 logger = get_logger(__name__)
 
+# Trail list cache: Nokia trail topology rarely changes sub-second, so
+# repeat queries for the same network_id within the TTL are served from
+# memory instead of paying a full Nokia OMS round-trip
+TRAIL_CACHE_TTL_SECONDS = float(os.getenv('TRAIL_CACHE_TTL_SECONDS', '15'))
+
+# Trail API base URL (OMS host) - resolved once at import instead of
+# rebuilt per request
+TRAIL_BASE = os.getenv('NOKIA_TRAIL_BASE', 'https://10.73.0.181:8443/oms1350/data/npr/trails')
+
+_trail_cache: Dict[str, Tuple[float, Any]] = {}  # network_id -> (fetched_at, data)
+_trail_cache_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _fresh_trail_entry(network_id: str) -> Optional[Any]:
+    """Return the cached trail list if it is within the TTL, else None"""
+    cached = _trail_cache.get(network_id)
+    if cached and time.monotonic() - cached[0] < TRAIL_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def _stale_trail_entry(network_id: str) -> Optional[Any]:
+    """Return the cached trail list regardless of age, or None"""
+    cached = _trail_cache.get(network_id)
+    return cached[1] if cached else None
+
+
 
 # Pydantic models for request/response
 class ErrorResponse(BaseModel):
@@ -50,6 +83,14 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 80)
 
     try:
+        # Shared async HTTP client: pooled keep-alive connections to the
+        # Nokia API that never block the event loop
+        app.state.http = httpx.AsyncClient(
+            verify=http_client.ssl_context,  # Shared context, self-signed certs
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128)
+        )
+
         # Initialize token manager
         token_manager.initialize()
 
@@ -63,7 +104,7 @@ async def lifespan(app: FastAPI):
         logger.info("=" * 80)
     except Exception as e:
         logger.error("=" * 80)
-        logger.error(f"✗ Failed to initialize services: {e}")
+        logger.error("✗ Failed to initialize services: %s", e)
         logger.error("=" * 80)
         raise
 
@@ -80,6 +121,9 @@ async def lifespan(app: FastAPI):
     # Stop token refresh
     token_manager.stop_auto_refresh()
 
+    # Close pooled HTTP connections
+    await app.state.http.aclose()
+
     logger.info("✓ Nokia Gateway API stopped gracefully")
     logger.info("=" * 80)
 
@@ -89,7 +133,10 @@ app = FastAPI(
     title="Nokia Gateway API",
     description="REST Gateway for Nokia API with automatic token management",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes responses several times faster than stdlib json,
+    # which matters for multi-thousand-trail payloads
+    default_response_class=ORJSONResponse
 )
 
 
@@ -170,7 +217,7 @@ async def get_alarm_status():
         }
 
     except Exception as e:
-        logger.error(f"✗ Error retrieving alarm status: {e}", exc_info=True)
+        logger.error("✗ Error retrieving alarm status: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve alarm status: {str(e)}"
@@ -193,99 +240,162 @@ async def get_trail_list(
     Raises:
         HTTPException: If the request fails
     """
-    try:
-        logger.info(f"→ Received trail_list request for network_id: {network_id}")
-
-        # Check if token is valid
-        if not token_manager.is_token_valid():
-            logger.warning("Token validation failed, attempting refresh...")
-            try:
-                token_manager.refresh_access_token()
-                logger.info("Token refreshed successfully after validation failure")
-            except Exception as e:
-                logger.error(f"✗ Failed to refresh token: {e}")
+    logger.info("→ Received trail_list request for network_id: %s", network_id)
+
+    # Fast path: serve fresh cache hits without touching the lock
+    cached = _fresh_trail_entry(network_id)
+    if cached is not None:
+        logger.info("✓ Trail list for network %s served from cache", network_id)
+        return cached
+
+    # Per-network lock so concurrent misses trigger a single upstream fetch
+    lock = _trail_cache_locks.setdefault(network_id, asyncio.Lock())
+
+    async with lock:
+        # Another request may have repopulated the cache while we waited
+        cached = _fresh_trail_entry(network_id)
+        if cached is not None:
+            logger.info("✓ Trail list for network %s served from cache", network_id)
+            return cached
+
+        try:
+            # Cheap in-memory expiry check only - the background refresher
+            # renews tokens proactively, so the hot path never does auth I/O
+            if not token_manager.is_token_valid():
+                logger.warning("Token not valid, background refresh will recover")
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     detail="Authentication service unavailable"
                 )
 
-        # Get authorization header
-        headers = token_manager.get_authorization_header()
-        logger.debug("Authorization header obtained")
+            # Get authorization header
+            headers = token_manager.get_authorization_header()
+            logger.debug("Authorization header obtained")
 
-        # Make request to Nokia API
-        endpoint = f"https://10.73.0.181:8443/oms1350/data/npr/trails/{network_id}"
+            # Make request to Nokia API
+            endpoint = f"{TRAIL_BASE}/{network_id}"
 
-        logger.info(f"Requesting trail data from Nokia API: {endpoint}")
+            logger.info("Requesting trail data from Nokia API: %s", endpoint)
 
-        response = requests.get(
-            endpoint,
-            headers=headers,
-            verify=False,
-            timeout=30
-        )
+            response = await app.state.http.get(endpoint, headers=headers)
+
+            logger.debug("Nokia API response status: %s", response.status_code)
 
-        logger.debug(f"Nokia API response status: {response.status_code}")
+            # Handle different status codes
+            if response.status_code == 401:
+                logger.error("✗ Authentication failed (401 Unauthorized)")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Authentication failed"
+                )
+            elif response.status_code == 404:
+                logger.warning("Network ID %s not found (404)", network_id)
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Network ID {network_id} not found"
+                )
+            elif response.status_code >= 500:
+                logger.error("✗ Nokia API server error: %s", response.status_code)
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="Nokia API server error"
+                )
 
-        # Handle different status codes
-        if response.status_code == 401:
-            logger.error("✗ Authentication failed (401 Unauthorized)")
+            response.raise_for_status()
+            trail_data = orjson.loads(response.content)
+
+            _trail_cache[network_id] = (time.monotonic(), trail_data)
+
+            logger.info("✓ Successfully retrieved trail list for network %s", network_id)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  Trails count: %s",
+                            len(trail_data) if isinstance(trail_data, list) else 1)
+
+            return trail_data
+
+        except HTTPException as e:
+            # Upstream/auth outage: fall back to the last stale snapshot so
+            # clients keep getting data through Nokia maintenance windows
+            if e.status_code in (
+                status.HTTP_502_BAD_GATEWAY,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+            ):
+                stale = _stale_trail_entry(network_id)
+                if stale is not None:
+                    logger.warning("⚠ Upstream failure (%s), serving stale trail list for network %s",
+                                   e.status_code, network_id)
+                    return stale
+            raise
+        except httpx.TimeoutException:
+            logger.error("✗ Request to Nokia API timed out (30s timeout)")
+            logger.error("  Endpoint: %s", endpoint)
+            stale = _stale_trail_entry(network_id)
+            if stale is not None:
+                logger.warning("⚠ Upstream timeout, serving stale trail list for network %s", network_id)
+                return stale
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication failed"
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Request to Nokia API timed out"
             )
-        elif response.status_code == 404:
-            logger.warning(f"Network ID {network_id} not found (404)")
+        except httpx.HTTPError as e:
+            logger.error("✗ Request to Nokia API failed: %s", e)
+            logger.error("  Endpoint: %s", endpoint)
+            stale = _stale_trail_entry(network_id)
+            if stale is not None:
+                logger.warning("⚠ Upstream failure, serving stale trail list for network %s", network_id)
+                return stale
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Network ID {network_id} not found"
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Failed to communicate with Nokia API: {str(e)}"
             )
-        elif response.status_code >= 500:
-            logger.error(f"✗ Nokia API server error: {response.status_code}")
+        except Exception as e:
+            logger.error("✗ Unexpected error in trail_list endpoint: %s", e, exc_info=True)
             raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail="Nokia API server error"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal server error: {str(e)}"
             )
 
-        response.raise_for_status()
-        trail_data = response.json()
 
-        trails_count = len(trail_data) if isinstance(trail_data, list) else 1
-        logger.info(f"✓ Successfully retrieved trail list for network {network_id}")
-        logger.info(f"  Trails count: {trails_count}")
+@app.get("/api/v1/nokia_gateway/trail_lists", tags=["Trail"])
+async def get_trail_lists(
+    network_ids: List[str] = Query(..., description="Network IDs to fetch trail lists for")
+) -> Dict[str, Any]:
+    """
+    Get trail lists for several network IDs concurrently
 
-        return trail_data
+    Independent Nokia API calls are issued in parallel over the shared
+    keep-alive pool, so the wall-clock latency of a composite fetch is
+    the slowest single call rather than the sum of all of them.
 
-    except HTTPException:
-        # Re-raise HTTPException as-is
-        raise
-    except requests.exceptions.Timeout:
-        logger.error("✗ Request to Nokia API timed out (30s timeout)")
-        logger.error(f"  Endpoint: {endpoint}")
-        raise HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail="Request to Nokia API timed out"
-        )
-    except requests.exceptions.RequestException as e:
-        logger.error(f"✗ Request to Nokia API failed: {e}")
-        logger.error(f"  Endpoint: {endpoint}")
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to communicate with Nokia API: {str(e)}"
-        )
-    except Exception as e:
-        logger.error(f"✗ Unexpected error in trail_list endpoint: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+    Args:
+        network_ids: One or more network IDs (repeat the query parameter)
+
+    Returns:
+        Mapping of network_id to its trail list
+
+    Raises:
+        HTTPException: If any of the requests fails
+    """
+    logger.info("→ Received trail_lists request for %s network(s)", len(network_ids))
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                network_id: tg.create_task(get_trail_list(network_id))
+                for network_id in dict.fromkeys(network_ids)
+            }
+    except* HTTPException as eg:
+        # Surface the first per-network failure with its original status
+        raise eg.exceptions[0]
+
+    return {network_id: task.result() for network_id, task in tasks.items()}
 
 
 # Exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -297,8 +407,8 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Internal server error",
@@ -310,10 +420,21 @@ async def general_exception_handler(request, exc):
 if __name__ == "__main__":
     import uvicorn
 
-    logger.info("Starting Nokia Gateway API on port 6778...")
+    # Each worker runs its own lifespan (token refresh, alarm
+    # subscription, Kafka consumer), so the alarm pipeline is duplicated
+    # per worker. Default stays at 1; raise GW_WORKERS to scale the
+    # stateless trail_list serving across cores when that is acceptable.
+    workers = int(os.getenv('GW_WORKERS', '1'))
+
+    logger.info("Starting Nokia Gateway API on port 6778 with %s worker(s)...", workers)
     uvicorn.run(
-        app,
+        "nokia_gateway:app",
         host="0.0.0.0",
         port=6778,
+        workers=workers,
+        # libuv event loop + C HTTP parser: same Python logic, much less
+        # time spent in asyncio scheduling and request parsing
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
@@ -3,69 +3,69 @@
 Test script for Nokia Gateway API
 """
 
-import requests
-import json
-import time
+import asyncio
 
-# Disable SSL warnings
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import httpx
+import orjson
 
 GATEWAY_URL = "http://localhost:6778"
+TRAIL_LIST_URL = f"{GATEWAY_URL}/api/v1/nokia_gateway/trail_list"
 
 
-def test_root():
+async def test_root(client: httpx.AsyncClient):
     """Test root endpoint"""
     print("\n=== Testing Root Endpoint ===")
     try:
-        response = requests.get(f"{GATEWAY_URL}/")
+        response = await client.get(f"{GATEWAY_URL}/")
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
         return response.status_code == 200
     except Exception as e:
         print(f"Error: {e}")
         return False
 
 
-def test_health():
+async def test_health(client: httpx.AsyncClient):
     """Test health check endpoint"""
     print("\n=== Testing Health Check Endpoint ===")
     try:
-        response = requests.get(f"{GATEWAY_URL}/health")
+        response = await client.get(f"{GATEWAY_URL}/health")
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
         return response.status_code == 200
     except Exception as e:
         print(f"Error: {e}")
         return False
 
 
-def test_trail_list(network_id="788602"):
+async def test_trail_list(client: httpx.AsyncClient, network_id="788602"):
     """Test trail list endpoint"""
     print(f"\n=== Testing Trail List Endpoint (network_id={network_id}) ===")
     try:
-        url = f"{GATEWAY_URL}/api/v1/nokia_gateway/trail_list"
         params = {"network_id": network_id}
 
-        print(f"Request URL: {url}")
+        print(f"Request URL: {TRAIL_LIST_URL}")
         print(f"Parameters: {params}")
 
-        response = requests.get(url, params=params, timeout=30)
+        response = await client.get(TRAIL_LIST_URL, params=params)
         print(f"Status Code: {response.status_code}")
 
+        # Read the raw body once; parse or decode it exactly once below
+        body = response.content
+
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(body)
             print(f"Response type: {type(data)}")
             if isinstance(data, list):
                 print(f"Number of trails: {len(data)}")
                 if len(data) > 0:
                     print(f"\nFirst trail sample:")
-                    print(json.dumps(data[0], indent=2))
+                    print(orjson.dumps(data[0], option=orjson.OPT_INDENT_2).decode())
             else:
-                print(f"Response: {json.dumps(data, indent=2)}")
+                print(f"Response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
             return True
         else:
-            print(f"Error Response: {response.text}")
+            print(f"Error Response: {body.decode('utf-8', errors='replace')}")
             return False
 
     except Exception as e:
@@ -73,47 +73,53 @@ def test_trail_list(network_id="788602"):
         return False
 
 
-def test_trail_list_invalid_network():
+async def test_trail_list_invalid_network(client: httpx.AsyncClient):
     """Test trail list endpoint with invalid network ID"""
     print("\n=== Testing Trail List Endpoint with Invalid Network ID ===")
     try:
-        url = f"{GATEWAY_URL}/api/v1/nokia_gateway/trail_list"
         params = {"network_id": "999999"}
 
-        response = requests.get(url, params=params, timeout=30)
+        response = await client.get(TRAIL_LIST_URL, params=params)
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.text}")
 
         # Nokia API returns 200 with empty list for non-existent network IDs
         # So we expect 200 status code with empty list
+        body = response.content
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(body)
+            print(f"Response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
             return isinstance(data, list) and len(data) == 0
+
+        print(f"Error Response: {body.decode('utf-8', errors='replace')}")
         return False
     except Exception as e:
         print(f"Error: {e}")
         return False
 
 
+async def run_tests():
+    """Run all independent probes concurrently over one connection pool"""
+    async with httpx.AsyncClient(timeout=30) as client:
+        outcomes = await asyncio.gather(
+            test_root(client),
+            test_health(client),
+            test_trail_list(client),
+            test_trail_list_invalid_network(client),
+        )
+
+    return dict(zip(
+        ['root', 'health', 'trail_list', 'trail_list_invalid'],
+        outcomes
+    ))
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
     print("Nokia Gateway API - Test Suite")
     print("=" * 60)
 
-    results = {}
-
-    # Run tests
-    results['root'] = test_root()
-    time.sleep(1)
-
-    results['health'] = test_health()
-    time.sleep(1)
-
-    results['trail_list'] = test_trail_list()
-    time.sleep(1)
-
-    results['trail_list_invalid'] = test_trail_list_invalid_network()
+    results = asyncio.run(run_tests())
 
     # Print summary
     print("\n" + "=" * 60)
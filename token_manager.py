@@ -6,13 +6,18 @@ Manages Nokia API authentication tokens with automatic background refresh
 
 import requests
 import os
+import time
+import orjson
+import logging
 from datetime import datetime, timedelta
-from threading import Thread, Event, Lock
+from threading import Event, Lock, Timer
 import urllib3
 from typing import Optional, Dict
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 import base64
 
+from http_client import build_session
 from log_config import get_logger
 
 # Disable SSL warnings for self-signed certificates
@@ -21,51 +26,92 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Get configured logger
 logger = get_logger(__name__)
 
+# Resolve configuration once at import: the .env parse, getenv lookups
+# and int conversion don't need to repeat on every construction attempt
+load_dotenv()
 
-class TokenManager:
-    """Manages authentication tokens with automatic background refresh for Nokia API"""
+_BASE_URL = os.getenv('API_BASE_URL', 'https://10.73.0.181/rest-gateway/rest/api/v1').rstrip('/')
+_USERNAME = os.getenv('API_USERNAME')
+_PASSWORD = os.getenv('API_PASSWORD')
+_REFRESH_INTERVAL = int(os.getenv('TOKEN_REFRESH_INTERVAL', '3000'))
 
-    _instance = None
-    _lock = Lock()
+# Fail fast on a malformed base URL instead of erroring on the first
+# token request
+_split = urlsplit(_BASE_URL)
+if _split.scheme not in ('http', 'https') or not _split.netloc:
+    raise ValueError(f"API_BASE_URL is not a valid URL: {_BASE_URL!r}")
+del _split
 
-    def __new__(cls):
-        """Singleton pattern to ensure only one token manager instance"""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
 
-    def __init__(self):
-        """Initialize the token manager (only once due to singleton pattern)"""
-        if hasattr(self, '_initialized'):
-            logger.debug("TokenManager already initialized, reusing instance")
-            return
+class TokenManager:
+    """Manages authentication tokens with automatic background refresh for Nokia API
 
-        # Load environment variables
-        load_dotenv()
+    The module-level ``token_manager`` instance created at import time is
+    the shared singleton; import that rather than constructing this class.
+    The previous lock-guarded __new__ made every TokenManager() call pay a
+    lock acquisition and hasattr check for no benefit, since all callers
+    already import the module-level instance.
+    """
 
-        self.base_url = os.getenv('API_BASE_URL', 'https://10.73.0.181/rest-gateway/rest/api/v1').rstrip('/')
-        self.username = os.getenv('API_USERNAME')
-        self.password = os.getenv('API_PASSWORD')
-        self.refresh_interval = int(os.getenv('TOKEN_REFRESH_INTERVAL', '3000'))
+    def __init__(self):
+        """Initialize the token manager"""
+        # Configuration was parsed and validated at module import; the
+        # constructor only copies references
+        self.base_url = _BASE_URL
+        self.username = _USERNAME
+        self.password = _PASSWORD
+        self.refresh_interval = _REFRESH_INTERVAL
+
+        # Credentials and the token URL never change for the process
+        # lifetime: encode/build them once instead of on every auth call
+        # (and every retry during a failure storm)
+        encoded_credentials = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        # Accept-Encoding: identity - token responses are under 1KB, so
+        # gzip would cost a codec pass for no bandwidth win
+        self._basic_auth_headers = {
+            "Authorization": f"Basic {encoded_credentials}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "identity"
+        }
+        self._refresh_headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": "identity"
+        }
+        self._token_url = f"{self.base_url}/auth/token"
 
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.token_type: str = "Bearer"
         self.expires_in: int = 3600
         self.token_expiry: Optional[datetime] = None
-
-        # Threading control
+        # Monotonic expiry deadline: immune to NTP/DST wall-clock jumps
+        # and cheaper to compare than datetime arithmetic. token_expiry
+        # above is kept only for human-readable log output.
+        self._expiry_monotonic: Optional[float] = None
+        # Built under the token lock at rotation time, read lock-free on
+        # the request path (dict reference assignment is atomic)
+        self._auth_header_cache: Optional[Dict[str, str]] = None
+        # Consistent snapshot of (access, refresh, type, expires_in),
+        # published by one atomic reference write per rotation so readers
+        # never need the lock
+        self._tokens: Optional[tuple] = None
+
+        # Persistent session from the shared factory: keep-alive pooling
+        # plus the process-wide SSL context, so refreshes skip the
+        # TCP+TLS handshake after the first request
+        self._session = build_session(pool_connections=4, pool_maxsize=10)
+
+        # Threading control: the refresh schedule is a chain of one-shot
+        # timers rather than a persistent worker thread, so no thread
+        # stack sits parked between refreshes
         self._stop_event = Event()
-        self._refresh_thread: Optional[Thread] = None
+        self._timer: Optional[Timer] = None
+        self._backoff = 0.0
         self._token_lock = Lock()
 
-        self._initialized = True
         logger.info("TokenManager singleton instance created")
-        logger.info(f"API Base URL: {self.base_url}")
-        logger.info(f"Username: {self.username}")
-        logger.info(f"Token refresh interval: {self.refresh_interval} seconds ({self.refresh_interval/60:.1f} minutes)")
+        logger.info("API Base URL: %s, username: %s, refresh interval: %s seconds",
+                    self.base_url, self.username, self.refresh_interval)
 
     def get_initial_token(self) -> Dict:
         """
@@ -74,34 +120,25 @@ class TokenManager:
         Returns:
             dict: Token response containing access_token, refresh_token, etc.
         """
-        url = f"{self.base_url}/auth/token"
+        url = self._token_url
         payload = {
             "grant_type": "client_credentials"
         }
 
-        # Create Basic Auth header
-        credentials = f"{self.username}:{self.password}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        headers = {
-            "Authorization": f"Basic {encoded_credentials}",
-            "Content-Type": "application/json"
-        }
-
         try:
-            logger.info(f"Requesting initial token from {url}")
-            logger.debug(f"Using username: {self.username}")
+            logger.info("Requesting initial token from %s", url)
+            logger.debug("Using username: %s", self.username)
 
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers=headers,
-                json=payload,
-                verify=False,
+                headers=self._basic_auth_headers,
+                data=orjson.dumps(payload),
                 timeout=30
             )
 
-            logger.debug(f"Token request response status: {response.status_code}")
+            logger.debug("Token request response status: %s", response.status_code)
             response.raise_for_status()
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
 
             # Update internal state with thread safety
             with self._token_lock:
@@ -110,17 +147,20 @@ class TokenManager:
                 self.token_type = token_data.get('token_type', 'Bearer')
                 self.expires_in = token_data.get('expires_in', 3600)
                 self.token_expiry = datetime.now() + timedelta(seconds=self.expires_in)
+                self._expiry_monotonic = time.monotonic() + self.expires_in
+                self._auth_header_cache = {
+                    "Authorization": f"{self.token_type} {self.access_token}"
+                }
+                self._tokens = (self.access_token, self.refresh_token,
+                                self.token_type, self.expires_in)
 
-            logger.info(f"✓ Initial token obtained successfully")
-            logger.info(f"Token type: {self.token_type}")
-            logger.info(f"Expires in: {self.expires_in} seconds ({self.expires_in/60:.1f} minutes)")
-            logger.info(f"Expiry time: {self.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info("✓ Initial token obtained successfully (type: %s, expires in %s seconds, expiry: %s)",
+                        self.token_type, self.expires_in, self.token_expiry)
 
             return token_data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to obtain initial token: {e}")
-            logger.error(f"Request URL: {url}")
+            logger.error("✗ Failed to obtain initial token: %s (URL: %s)", e, url)
             raise
 
     def refresh_access_token(self) -> Dict:
@@ -130,13 +170,15 @@ class TokenManager:
         Returns:
             dict: New token response
         """
-        with self._token_lock:
-            current_refresh_token = self.refresh_token
+        # Lock-free snapshot: the tuple reference is replaced atomically
+        # at rotation, so no lock round-trip before the 30s HTTP call
+        tokens = self._tokens
+        current_refresh_token = tokens[1] if tokens else None
 
         if not current_refresh_token:
             raise ValueError("No refresh token available. Please obtain initial token first.")
 
-        url = f"{self.base_url}/auth/token"
+        url = self._token_url
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": current_refresh_token
@@ -144,19 +186,20 @@ class TokenManager:
 
         try:
             logger.info("Refreshing access token...")
-            logger.debug(f"Using refresh token: {current_refresh_token[:20]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using refresh token: %s...", current_refresh_token[:20])
 
-            response = requests.post(
+            response = self._session.post(
                 url,
-                json=payload,
-                verify=False,
+                headers=self._refresh_headers,
+                data=orjson.dumps(payload),
                 timeout=30
             )
 
-            logger.debug(f"Token refresh response status: {response.status_code}")
+            logger.debug("Token refresh response status: %s", response.status_code)
             response.raise_for_status()
 
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
 
             # Update internal state with thread safety
             with self._token_lock:
@@ -165,19 +208,31 @@ class TokenManager:
                 self.token_type = token_data.get('token_type', 'Bearer')
                 self.expires_in = token_data.get('expires_in', 3600)
                 self.token_expiry = datetime.now() + timedelta(seconds=self.expires_in)
+                self._expiry_monotonic = time.monotonic() + self.expires_in
+                self._auth_header_cache = {
+                    "Authorization": f"{self.token_type} {self.access_token}"
+                }
+                self._tokens = (self.access_token, self.refresh_token,
+                                self.token_type, self.expires_in)
 
-            logger.info(f"✓ Token refreshed successfully")
-            logger.info(f"New expiry time: {self.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
-            logger.info(f"Next refresh in: {self.refresh_interval} seconds ({self.refresh_interval/60:.1f} minutes)")
+            logger.info("✓ Token refreshed successfully (new expiry: %s)", self.token_expiry)
 
             return token_data
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"✗ Failed to refresh token: {e}")
-            logger.error(f"Request URL: {url}")
-            logger.error(f"This may cause authentication failures until next retry")
+            logger.error("✗ Failed to refresh token: %s (URL: %s)", e, url)
+            logger.error("This may cause authentication failures until next retry")
             raise
 
+    def get_session(self) -> requests.Session:
+        """
+        Get the shared pooled session for downstream Nokia API calls
+
+        Returns:
+            requests.Session: Session with keep-alive pooling and retries
+        """
+        return self._session
+
     def get_authorization_header(self) -> Dict[str, str]:
         """
         Get the authorization header for API requests
@@ -185,77 +240,99 @@ class TokenManager:
         Returns:
             dict: Authorization header
         """
-        with self._token_lock:
-            if not self.access_token:
-                raise ValueError("No access token available. Please authenticate first.")
+        # Lock-free read: the cache dict is replaced atomically at token
+        # rotation, so the hot request path never contends on the lock or
+        # formats a string. Return a copy so callers adding their own
+        # headers can't pollute the shared cache.
+        header = self._auth_header_cache
+        if header is None:
+            raise ValueError("No access token available. Please authenticate first.")
 
-            return {
-                "Authorization": f"{self.token_type} {self.access_token}"
-            }
+        return dict(header)
 
     def start_auto_refresh(self):
-        """Start automatic token refresh in background thread"""
-        if self._refresh_thread and self._refresh_thread.is_alive():
-            logger.warning("Auto-refresh thread is already running")
+        """Start automatic token refresh via a self-rescheduling timer"""
+        if self._timer is not None:
+            logger.warning("Auto-refresh timer is already running")
             return
 
         self._stop_event.clear()
-        self._refresh_thread = Thread(
-            target=self._auto_refresh_worker,
-            daemon=True,
-            name="TokenRefreshThread"
-        )
-        self._refresh_thread.start()
-        logger.info(f"✓ Auto-refresh thread started")
-        logger.info(f"Refresh interval: {self.refresh_interval} seconds ({self.refresh_interval/60:.1f} minutes)")
-        logger.info(f"Thread name: {self._refresh_thread.name}")
-
-    def _auto_refresh_worker(self):
-        """Worker thread for automatic token refresh"""
-        logger.info("Auto-refresh worker thread started")
-
-        while not self._stop_event.is_set():
-            # Wait for the specified interval or until stop event is set
-            logger.debug(f"Waiting {self.refresh_interval} seconds before next refresh...")
-            if self._stop_event.wait(timeout=self.refresh_interval):
-                logger.info("Stop event received, exiting auto-refresh worker")
-                break
-
-            try:
-                logger.info("Auto-refresh cycle triggered")
-                self.refresh_access_token()
-            except requests.exceptions.HTTPError as e:
-                # If refresh fails with 400/401, token is invalid - get new initial token
-                if e.response and e.response.status_code in [400, 401]:
-                    logger.warning(f"✗ Refresh token invalid (HTTP {e.response.status_code})")
-                    logger.info("Attempting to obtain new initial token...")
-                    try:
-                        self.get_initial_token()
-                        logger.info("✓ Successfully obtained new initial token")
-                    except Exception as init_error:
-                        logger.error(f"✗ Failed to obtain new initial token: {init_error}")
-                        logger.error("Will retry on next cycle")
-                else:
-                    logger.error(f"✗ Auto-refresh failed: {e}")
-                    logger.error("Will retry on next cycle")
-            except Exception as e:
-                logger.error(f"✗ Auto-refresh failed: {e}")
-                logger.error("Will retry on next cycle")
-
-        logger.info("Auto-refresh worker thread stopped")
+        self._backoff = 0.0
+        self._schedule_refresh(self._next_refresh_timeout())
+        logger.info("✓ Auto-refresh timer started (%s)", self._timer.name)
+
+    def _next_refresh_timeout(self) -> float:
+        """
+        Compute how long to sleep before the next refresh attempt
+
+        Sleeps until 60 seconds before the actual token expiry (derived
+        from the server-provided expires_in) rather than a fixed interval,
+        so refreshes land just-in-time even if the server changes token
+        lifetimes. Falls back to the configured interval when no token
+        has been obtained yet.
+        """
+        expiry = self._expiry_monotonic
+        if expiry is None:
+            return self.refresh_interval
+
+        return max(5, expiry - time.monotonic() - 60)
+
+    def _schedule_refresh(self, timeout: float):
+        """Arm a one-shot timer for the next refresh attempt"""
+        timer = Timer(timeout, self._refresh_and_reschedule)
+        timer.daemon = True
+        timer.name = "TokenRefreshTimer"
+        self._timer = timer
+        timer.start()
+
+    def _refresh_and_reschedule(self):
+        """Timer callback: refresh the token, then arm the next timer
+
+        Each run executes on a short-lived timer thread, so no thread
+        stack is parked between refreshes. After a failure the next
+        timer fires within seconds (exponential backoff) instead of
+        waiting out a full token lifetime.
+        """
+        if self._stop_event.is_set():
+            return
+
+        try:
+            logger.info("Auto-refresh cycle triggered")
+            self.refresh_access_token()
+            self._backoff = 0.0
+        except requests.exceptions.HTTPError as e:
+            # If refresh fails with 400/401, token is invalid - get new initial token
+            if e.response and e.response.status_code in [400, 401]:
+                logger.warning("✗ Refresh token invalid (HTTP %s)", e.response.status_code)
+                logger.info("Attempting to obtain new initial token...")
+                try:
+                    self.get_initial_token()
+                    logger.info("✓ Successfully obtained new initial token")
+                    self._backoff = 0.0
+                except Exception as init_error:
+                    self._backoff = min(self._backoff * 2, 60) if self._backoff else 1
+                    logger.error("✗ Failed to obtain new initial token: %s, will retry in %.0f seconds",
+                                 init_error, self._backoff)
+            else:
+                self._backoff = min(self._backoff * 2, 60) if self._backoff else 1
+                logger.error("✗ Auto-refresh failed: %s, will retry in %.0f seconds", e, self._backoff)
+        except Exception as e:
+            self._backoff = min(self._backoff * 2, 60) if self._backoff else 1
+            logger.error("✗ Auto-refresh failed: %s, will retry in %.0f seconds", e, self._backoff)
+
+        if not self._stop_event.is_set():
+            self._schedule_refresh(self._backoff if self._backoff else self._next_refresh_timeout())
 
     def stop_auto_refresh(self):
         """Stop the automatic token refresh"""
-        if self._refresh_thread and self._refresh_thread.is_alive():
-            logger.info("Stopping auto-refresh thread...")
+        if self._timer is not None:
+            logger.info("Stopping auto-refresh timer...")
             self._stop_event.set()
-            self._refresh_thread.join(timeout=5)
-            if self._refresh_thread.is_alive():
-                logger.warning("Auto-refresh thread did not stop gracefully within timeout")
-            else:
-                logger.info("✓ Auto-refresh thread stopped successfully")
+            self._timer.cancel()
+            self._timer = None
+            logger.info("✓ Auto-refresh timer stopped successfully")
         else:
-            logger.debug("Auto-refresh thread is not running")
+            logger.debug("Auto-refresh timer is not running")
 
     def is_token_valid(self) -> bool:
         """
@@ -264,29 +341,25 @@ class TokenManager:
         Returns:
             bool: True if token is valid, False otherwise
         """
-        with self._token_lock:
-            if not self.access_token or not self.token_expiry:
-                return False
+        # Lock-free: the deadline float is published atomically at
+        # rotation time, same as the header cache
+        expiry = self._expiry_monotonic
+        if expiry is None:
+            return False
 
-            # Consider token invalid if it expires in less than 60 seconds
-            return datetime.now() < (self.token_expiry - timedelta(seconds=60))
+        # Consider token invalid if it expires in less than 60 seconds
+        return time.monotonic() < expiry - 60
 
     def initialize(self):
         """Initialize the token manager by obtaining token and starting auto-refresh"""
-        logger.info("=" * 60)
         logger.info("Initializing Token Manager")
-        logger.info("=" * 60)
 
         try:
             self.get_initial_token()
             self.start_auto_refresh()
-            logger.info("=" * 60)
             logger.info("✓ Token Manager initialized successfully and ready")
-            logger.info("=" * 60)
         except Exception as e:
-            logger.error("=" * 60)
-            logger.error(f"✗ Token Manager initialization failed: {e}")
-            logger.error("=" * 60)
+            logger.error("✗ Token Manager initialization failed: %s", e)
             raise
 
 